@@ -1,6 +1,38 @@
+import collections
 import sqlite3
 import struct
 import os
+import sys
+
+import numpy as np
+
+# Precompiled codec for the 1-byte sensor count header.
+_HDR = struct.Struct('<B')
+
+# Structured dtype matching the 23-byte wire record (MAC, temperature,
+# humidity, RSSI). Must stay unaligned so it overlays the blob exactly.
+# The MAC is a fixed (6,) byte sub-array rather than 'S6': S-dtype
+# scalars strip trailing NUL bytes, which would corrupt addresses
+# ending in 0x00 octets.
+DTYPE = np.dtype([('mac', 'u1', (6,)),
+                  ('temperature', '<f8'),
+                  ('humidity', '<f8'),
+                  ('rssi', 'i1')], align=False)
+assert DTYPE.itemsize == 23, "DTYPE does not match the 23-byte wire record"
+_REC_SIZE = DTYPE.itemsize
+
+_EMPTY = np.empty(0, dtype=DTYPE)
+
+# Hand BLOB columns to the decoder as a memoryview buffer rather than a
+# fresh bytes copy; np.frombuffer/unpack_from accept buffers directly.
+sqlite3.register_converter("BLOB", memoryview)
+
+# One SQL string with a bound LIMIT: identical text on every poll, so
+# SQLite's per-connection statement cache reuses the prepared statement
+# instead of reparsing when this is run as a long-lived gateway reader.
+LATEST_ENTRIES_SQL = (
+    'SELECT TIMESTAMP, DATA AS "DATA [BLOB]" '
+    'FROM sensor_readings_aggregated ORDER BY ID DESC LIMIT ?')
 
 def decode_sensor_data_blob(blob_data):
     """
@@ -18,74 +50,167 @@ def decode_sensor_data_blob(blob_data):
         blob_data (bytes): The binary data read from the 'DATA' column.
 
     Returns:
-        list: A list of dictionaries, each representing a decoded SensorData entry.
-              Returns an empty list if decoding fails or data is malformed.
+        numpy.ndarray: A structured array with fields 'mac', 'temperature',
+              'humidity' and 'rssi', one element per sensor. The array is a
+              zero-copy view over blob_data (read-only). Returns an empty
+              array if decoding fails or data is malformed.
     """
-    decoded_entries = []
-    offset = 0
-
     try:
         if not blob_data:
             print("Warning: Received empty blob data.")
-            return []
+            return _EMPTY
 
         # 1. Total Number of Sensors (1 byte)
-        if len(blob_data) < 1:
-            print("Error: Blob too short for number of sensors.")
-            return []
-        num_sensors = struct.unpack('<B', blob_data[offset:offset+1])[0]
-        offset += 1
-
-        for _ in range(num_sensors):
-            entry = {}
-
-            # MAC Address (fixed 6 bytes)
-            if len(blob_data) < offset + 6:
-                print("Error: Blob too short for MAC address (expected 6 bytes).")
-                return []
-            mac_bytes = blob_data[offset:offset+6]
-            entry['mac_address'] = ":".join(f"{b:02X}" for b in mac_bytes)
-            offset += 6
-
-            # Predefined Name and Decoded Device Name are no longer in the blob.
-            # We can set them to N/A or derive them if a mapping is available elsewhere.
-            entry['predefined_name'] = "N/A (Not stored in blob)"
-            entry['decoded_device_name'] = "N/A (Not stored in blob)"
-
-            # Temperature (double)
-            if len(blob_data) < offset + 8:
-                print("Error: Blob too short for temperature (8 bytes).")
-                return []
-            entry['temperature'] = struct.unpack('<d', blob_data[offset:offset+8])[0]
-            offset += 8
-
-            # Humidity (double)
-            if len(blob_data) < offset + 8:
-                print("Error: Blob too short for humidity (8 bytes).")
-                return []
-            entry['humidity'] = struct.unpack('<d', blob_data[offset:offset+8])[0]
-            offset += 8
-
-            # RSSI (int8)
-            if len(blob_data) < offset + 1:
-                print("Error: Blob too short for RSSI (1 byte).")
-                return []
-            entry['rssi'] = struct.unpack('<b', blob_data[offset:offset+1])[0]
-            offset += 1
-
-            decoded_entries.append(entry)
+        num_sensors = _HDR.unpack_from(blob_data, 0)[0]
+
+        # One up-front size check instead of per-field checks in the loop.
+        expected_len = 1 + num_sensors * _REC_SIZE
+        if len(blob_data) < expected_len:
+            print(f"Error: Blob too short ({len(blob_data)} bytes, "
+                  f"expected {expected_len} for {num_sensors} sensors).")
+            return _EMPTY
+
+        # 2. Overlay the record array directly on the blob: one C-level
+        # copy-free view instead of per-sensor Python objects.
+        return np.frombuffer(blob_data, dtype=DTYPE, count=num_sensors,
+                             offset=1)
 
     except struct.error as e:
         print(f"Error decoding binary data: {e}")
-        return []
-    except IndexError as e:
-        print(f"Error accessing blob data (IndexError): {e}")
-        return []
+        return _EMPTY
+    except ValueError as e:
+        print(f"Error viewing blob data as records: {e}")
+        return _EMPTY
     except Exception as e:
         print(f"An unexpected error occurred during decoding: {e}")
-        return []
+        return _EMPTY
+
+def decode_blobs(blobs):
+    """
+    Decodes a batch of aggregated sensor blobs into one structured array.
+
+    Intended for bulk processing: each blob is overlaid zero-copy via
+    decode_sensor_data_blob() and the results are concatenated into a
+    single contiguous array, so downstream aggregation (min/max/mean
+    temperature, RSSI filtering) runs over the whole batch at once.
+
+    Args:
+        blobs (iterable): Blobs as read from the 'DATA' column.
+
+    Returns:
+        numpy.ndarray: A structured array with one element per sensor
+              across all blobs. Malformed blobs are skipped (after the
+              usual error message from decode_sensor_data_blob).
+    """
+    arrays = [arr for arr in map(decode_sensor_data_blob, blobs) if len(arr)]
+    if not arrays:
+        return _EMPTY
+    return np.concatenate(arrays)
+
+def columns(records):
+    """
+    Splits a structured array from decode_sensor_data_blob() or
+    decode_blobs() into typed per-field columns for aggregation.
+
+    Field views into the 23-byte records are strided, so each column is
+    compacted into its own contiguous buffer; aggregations such as
+    columns(arr)['temperature'].mean() then run vectorized over packed
+    doubles rather than boxed per-record Python floats.
+
+    Args:
+        records (numpy.ndarray): Structured array with DTYPE fields.
+
+    Returns:
+        dict: Field name -> contiguous 1-D numpy array.
+    """
+    return {name: np.ascontiguousarray(records[name])
+            for name in records.dtype.names}
 
-    return decoded_entries
+def store_readings(conn, entries):
+    """
+    Writes decoded readings into a normalized 'readings' table.
+
+    Args:
+        conn (sqlite3.Connection): A writable connection.
+        entries (iterable): (timestamp, records) pairs, where records is
+              a structured array from decode_sensor_data_blob().
+
+    All rows go through one executemany driven by a generator inside a
+    single transaction, so SQLite prepares the INSERT once and fsyncs
+    once instead of per row.
+    """
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS readings ("
+        "MAC TEXT, TEMPERATURE REAL, HUMIDITY REAL, RSSI INTEGER, "
+        "TIMESTAMP TEXT)")
+    with conn:
+        conn.executemany(
+            "INSERT INTO readings (MAC, TEMPERATURE, HUMIDITY, RSSI, TIMESTAMP) "
+            "VALUES (?, ?, ?, ?, ?)",
+            ((sensor.mac, sensor.temperature, sensor.humidity,
+              sensor.rssi, timestamp)
+             for timestamp, records in entries
+             for sensor in as_records(records)))
+
+def write_arrow_stream(sink, records):
+    """
+    Serializes a decoded structured array as an Arrow IPC record batch.
+
+    Downstream consumers (another process, disk archival) read the
+    columns zero-copy from the stream instead of unpickling a dict per
+    sensor. Requires pyarrow, which is only imported here so the rest of
+    the script stays dependency-free.
+
+    Args:
+        sink: A writable binary file-like object or a file path.
+        records (numpy.ndarray): Structured array with DTYPE fields.
+    """
+    import pyarrow as pa
+
+    cols = columns(records)
+    # The MAC goes out as fixed-size binary(6) built straight from the
+    # packed byte column, so every address stays exactly 6 bytes on the
+    # wire (a variable-length binary column would let pyarrow shorten
+    # values, corrupting addresses with trailing 0x00 octets).
+    mac_col = pa.Array.from_buffers(
+        pa.binary(6), len(records), [None, pa.py_buffer(cols['mac'])])
+    batch = pa.RecordBatch.from_arrays(
+        [mac_col,
+         pa.array(cols['temperature']),
+         pa.array(cols['humidity']),
+         pa.array(cols['rssi'])],
+        names=['mac', 'temperature', 'humidity', 'rssi'])
+    with pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+
+# 256-entry uppercase hex table: one list index per byte instead of a
+# lowercase bytes.hex(':') pass followed by a second .upper() pass.
+_HEX = [f"{i:02X}" for i in range(256)]
+
+def _format_mac(mac):
+    """Formats 6 raw MAC bytes as 'AA:BB:CC:DD:EE:FF'."""
+    return (f"{_HEX[mac[0]]}:{_HEX[mac[1]]}:{_HEX[mac[2]]}:"
+            f"{_HEX[mac[3]]}:{_HEX[mac[4]]}:{_HEX[mac[5]]}")
+
+Sensor = collections.namedtuple('Sensor', 'mac temperature humidity rssi')
+
+def as_records(records):
+    """
+    Converts a structured array from decode_sensor_data_blob() into a list
+    of Sensor namedtuples for per-sensor consumers like the printer in
+    main(). One tuple allocation per sensor instead of a 6-key dict.
+
+    Args:
+        records (numpy.ndarray): Structured array with DTYPE fields.
+
+    Returns:
+        list: A list of Sensor namedtuples, one per decoded entry.
+    """
+    return [
+        Sensor(_format_mac(mac),
+               float(temperature), float(humidity), int(rssi))
+        for mac, temperature, humidity, rssi in records
+    ]
 
 def main():
     # Determine the database path.
@@ -102,38 +227,61 @@ def main():
 
     conn = None
     try:
-        conn = sqlite3.connect(db_path)
+        # This script only ever reads, so open the database read-only and
+        # tune for scanning: query_only guards against stray writes,
+        # mmap_size lets SQLite read BLOB pages via mmap instead of
+        # syscalls, and cache_size=-65536 allows a 64 MiB page cache.
+        conn = sqlite3.connect(
+            f"file:{db_path}?mode=ro", uri=True,
+            detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES)
+        conn.execute("PRAGMA query_only=1")
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA cache_size=-65536")
         cursor = conn.cursor()
 
-        # Query the latest 20 aggregated entries
-        cursor.execute("SELECT TIMESTAMP, DATA FROM sensor_readings_aggregated ORDER BY ID DESC LIMIT 20;")
-        rows = cursor.fetchall()
+        # Query the latest 20 aggregated entries. Stream them in fetchmany
+        # batches instead of materializing everything with fetchall(), so
+        # larger LIMITs or full-table dumps keep a small working set.
+        cursor.arraysize = 64
+        cursor.execute(LATEST_ENTRIES_SQL, (20,))
+
+        entry_count = 0
+        while (rows := cursor.fetchmany()):
+            for timestamp, blob_data in rows:
+                entry_count += 1
+
+                # Keep one malformed entry from aborting the rest of the
+                # listing; it prints as a decode failure below.
+                try:
+                    decoded_sensors = as_records(decode_sensor_data_blob(blob_data))
+                except Exception as e:
+                    print(f"Error decoding entry {entry_count}: {e}")
+                    decoded_sensors = []
+
+                # Build the whole entry's text once and emit it with a
+                # single write instead of ~7 print() calls per sensor.
+                parts = [f"--- Entry {entry_count} (Timestamp: {timestamp}) ---\n"]
+                if decoded_sensors:
+                    for j, sensor in enumerate(decoded_sensors):
+                        # Predefined/decoded names are no longer stored in
+                        # the blob, so they print as fixed N/A text.
+                        parts.append(
+                            f"  Sensor {j+1}:\n"
+                            f"    MAC Address: {sensor.mac}\n"
+                            f"    Predefined Name: N/A (Not stored in blob)\n"
+                            f"    Decoded Device Name: N/A (Not stored in blob)\n"
+                            f"    Temperature: {sensor.temperature:.1f} C\n"
+                            f"    Humidity: {sensor.humidity:.1f} %\n"
+                            f"    RSSI: {sensor.rssi} dBm\n")
+                else:
+                    parts.append("  Failed to decode sensor data for this entry.\n")
+                parts.append("-" * 40 + "\n") # Separator
+                sys.stdout.write("".join(parts))
 
-        if not rows:
+        if entry_count == 0:
             print("No aggregated sensor data found in the database.")
-            return
-
-        print(f"Found {len(rows)} latest aggregated entries:\n")
-
-        for i, row in enumerate(rows):
-            timestamp = row[0]
-            blob_data = row[1]
-
-            print(f"--- Entry {i+1} (Timestamp: {timestamp}) ---")
-            decoded_sensors = decode_sensor_data_blob(blob_data)
-
-            if decoded_sensors:
-                for j, sensor in enumerate(decoded_sensors):
-                    print(f"  Sensor {j+1}:")
-                    print(f"    MAC Address: {sensor.get('mac_address', 'N/A')}")
-                    print(f"    Predefined Name: {sensor.get('predefined_name', 'N/A')}") # Will be "N/A (Not stored in blob)"
-                    print(f"    Decoded Device Name: {sensor.get('decoded_device_name', 'N/A')}") # Will be "N/A (Not stored in blob)"
-                    print(f"    Temperature: {sensor.get('temperature', 'N/A'):.1f} C")
-                    print(f"    Humidity: {sensor.get('humidity', 'N/A'):.1f} %")
-                    print(f"    RSSI: {sensor.get('rssi', 'N/A')} dBm")
-            else:
-                print("  Failed to decode sensor data for this entry.")
-            print("-" * 40) # Separator
+        else:
+            print(f"Displayed {entry_count} latest aggregated entries.")
 
     except sqlite3.Error as e:
         print(f"SQLite error: {e}")
@@ -0,0 +1,68 @@
+# cython: language_level=3
+"""
+Optional Cython fast path for decoding aggregated sensor blobs.
+
+Decodes the same wire format as decode_db.decode_sensor_data_blob (a
+1-byte sensor count followed by fixed 23-byte records) in a pure C loop
+with no interpreter overhead, for gateways decoding thousands of blobs
+per second. Assumes a little-endian host, matching the C++ producer.
+
+Build in place with:
+    python setup_cy.py build_ext --inplace
+"""
+import cython
+
+from libc.string cimport memcpy
+from cpython.unicode cimport PyUnicode_FromStringAndSize
+
+cdef const char* _HEX = b"0123456789ABCDEF"
+
+DEF REC_SIZE = 23
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def decode(const unsigned char[::1] buf):
+    """
+    Decodes one aggregated sensor blob.
+
+    Args:
+        buf: Any contiguous buffer (bytes, memoryview) holding the blob.
+
+    Returns:
+        list: A list of (mac_address, temperature, humidity, rssi) tuples,
+              one per sensor. Returns an empty list if the blob is malformed.
+    """
+    cdef Py_ssize_t n = buf.shape[0]
+    if n < 1:
+        return []
+
+    cdef unsigned int num_sensors = buf[0]
+    if n < 1 + <Py_ssize_t>num_sensors * REC_SIZE:
+        return []
+
+    cdef double temperature, humidity
+    cdef signed char rssi
+    cdef unsigned char b
+    cdef Py_ssize_t i, j, off
+    cdef char mac[17]
+
+    out = []
+    for i in range(num_sensors):
+        off = 1 + i * REC_SIZE
+
+        # "AA:BB:CC:DD:EE:FF" built via a hex-nibble table lookup.
+        for j in range(6):
+            b = buf[off + j]
+            mac[j * 3] = _HEX[b >> 4]
+            mac[j * 3 + 1] = _HEX[b & 0x0F]
+            if j < 5:
+                mac[j * 3 + 2] = c':'
+
+        memcpy(&temperature, &buf[off + 6], 8)
+        memcpy(&humidity, &buf[off + 14], 8)
+        rssi = <signed char>buf[off + 22]
+
+        out.append((PyUnicode_FromStringAndSize(mac, 17),
+                    temperature, humidity, rssi))
+    return out
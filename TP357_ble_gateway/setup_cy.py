@@ -0,0 +1,5 @@
+"""Builds the optional Cython blob decoder: python setup_cy.py build_ext --inplace"""
+from setuptools import setup
+from Cython.Build import cythonize
+
+setup(ext_modules=cythonize("decode_db_cy.pyx"))
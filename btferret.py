@@ -1,10 +1,12 @@
 import btlib.btfpy as btfpy
 import time
 import sys
-import select # Import select for non-blocking input (Unix-specific)
 
 # Define the iTag's fixed MAC address
 ITAG_MAC_ADDRESS = "23:06:17:02:84:37"
+# Normalized once at import (btfpy reports addresses in upper case), so
+# the discovery loop does a plain equality check per candidate.
+ITAG_MAC_ADDRESS_UPPER = ITAG_MAC_ADDRESS.upper()
 
 # --- CHARACTERISTIC INDICES (DIRECTLY FROM YOUR BTFERRET.PY SCAN OUTPUT) ---
 # Based on your btferret.py output:
@@ -98,15 +100,17 @@ def connect_and_monitor_itag():
     btfpy.Le_scan() 
 
     found_itag_node_id = -1
+    # Node ids are not contiguous: devices.txt can assign arbitrary ids
+    # (this repo's own file puts the iTag at NODE=7 with 2-6 unused), so
+    # skip empty slots rather than stopping at the first one.
     for node_candidate in range(1, 10001):
-        try:
-            address = btfpy.Device_address(node_candidate)
-            if address == ITAG_MAC_ADDRESS:
-                found_itag_node_id = node_candidate
-                print(f"Found iTag with MAC address {ITAG_MAC_ADDRESS} at current Node: {found_itag_node_id}")
-                break
-        except Exception:
-            pass
+        address = btfpy.Device_address(node_candidate)
+        if not address:
+            continue
+        if address == ITAG_MAC_ADDRESS_UPPER:
+            found_itag_node_id = node_candidate
+            print(f"Found iTag with MAC address {ITAG_MAC_ADDRESS} at current Node: {found_itag_node_id}")
+            break
 
     if found_itag_node_id == -1:
         print(f"iTag with MAC address {ITAG_MAC_ADDRESS} not found after scan.")
@@ -161,42 +165,11 @@ def connect_and_monitor_itag():
     try:
         # set_immediate_alert(current_itag_node_id, 1) # Set initial alert level to 1 (Mild Alert)
         while True:
-            # Read notifications with a short timeout.
-            # This ensures notifications are processed frequently.
-            btfpy.Read_notify(100) # Read for 100ms
-            
-            if False: # Placeholder for any other periodic tasks
-                # Check for user input. This will block until Enter is pressed.
-                try:
-                    # Use select.select to check for input without blocking indefinitely
-                    # This ensures notifications are processed even if no command is typed.
-                    rlist, _, _ = select.select([sys.stdin], [], [], 0.01) # 0.0 timeout for non-blocking
-                    if rlist: # If there's input available
-                        command = sys.stdin.readline().strip()
-                        if command: # Only process if input is not empty
-                            if command.startswith('a'):
-                                try:
-                                    level = int(command[1:])
-                                    set_immediate_alert(current_itag_node_id, level)
-                                except ValueError:
-                                    clear_prompt_if_active() # Clear prompt for error message
-                                    print("Invalid alert command format. Use a0, a1, or a2.")
-                                    display_prompt() # Re-prompt
-                            else:
-                                clear_prompt_if_active() # Clear prompt for unknown command
-                                print("Unknown command.")
-                                display_prompt() # Re-prompt
-                        else: # User just pressed Enter without typing a command
-                            display_prompt() # Re-prompt
-                except EOFError: # Handle Ctrl+D
-                    print("\nEOF detected. Exiting.")
-                    break # Exit the loop
-                except Exception as e:
-                    print(f"Input error: {e}")
-                    break # Exit on other input errors
-            
-            time.sleep(0.01) # Small delay to reduce CPU usage
-            
+            # Block inside the library waiting for notifications instead of
+            # waking every ~110 ms; callbacks fire as soon as data arrives
+            # and the loop sits idle otherwise.
+            btfpy.Read_notify(1000) # Read for 1s
+
     except KeyboardInterrupt:
         print("\nCtrl+C detected. Disconnecting from iTag.")
     finally: